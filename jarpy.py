@@ -1,26 +1,89 @@
 import argparse
+import codecs
+import itertools
 import json
 import logging
+import multiprocessing
+import operator
 import os
+import queue
+import re
+import shlex
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import zipfile
-from collections import defaultdict
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Literal, Tuple, Union
-
-import requests
+from typing import BinaryIO, Dict, Iterator, List, Literal, Tuple, Union
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 
 # A set of common binary file extensions to ignore in context mode.
-BINARY_EXTENSIONS = {
+BINARY_EXTENSIONS = frozenset({
     '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp',
     '.ogg', '.mp3', '.wav', '.flac',
     '.ttf', '.woff', '.woff2', '.eot',
     '.bin', '.dat', '.class'
+})
+
+# Matches names ending in any of BINARY_EXTENSIONS, so entries can be filtered without building a Path.
+_BINARY_RE = re.compile('(?:%s)$' % '|'.join(map(re.escape, sorted(BINARY_EXTENSIONS))), re.IGNORECASE)
+
+# zipfile (compression, compresslevel) for each --compress choice.
+# 'best' hands the archive to 7-Zip instead when it is installed.
+COMPRESSION_LEVELS = {
+    'none': (zipfile.ZIP_STORED, None),
+    'fast': (zipfile.ZIP_DEFLATED, 1),
+    'best': (zipfile.ZIP_DEFLATED, 9),
 }
 
+# Binary resources are only stripped from a JAR when they make up at least this share of its uncompressed size.
+# Below that, recompressing the kept classes costs more than the decompiler saves by skipping the resources.
+STRIP_MIN_RESOURCE_SHARE = 0.25
+
+# Files up to this size are read into memory and compressed in one call instead of streamed in 8 KiB blocks.
+ZIP_IN_MEMORY_MAX_SIZE = 16 * 1024 * 1024
+
+# Cached GitHub release metadata, reused for a day to stay clear of the API rate limit.
+RELEASE_CACHE_PATH = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'jarpy' / 'vineflower_release.json'
+RELEASE_CACHE_MAX_AGE = 24 * 60 * 60
+
+# JVM flags for the short-lived decompiler: serial GC and class-data sharing cut startup cost.
+# Single-JAR runs also stop at the C1 JIT; batches run long enough for C2 to pay off.
+# Both are replaced wholesale by the JARPY_JAVA_OPTS environment variable when it is set.
+JAVA_OPTS = ['-XX:+UseSerialGC', '-Xshare:auto']
+SINGLE_JAR_JAVA_OPTS = ['-XX:TieredStopAtLevel=1']
+
+# Buffer size used when streaming the decompiler download to disk.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Separator rules for the context file headers.
+_EQ25 = '=' * 25
+_EQ30 = '=' * 30
+
+# Default bytes of headers and sources collected before each write to a context file.
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Sources at least this large are copied into context files kernel-side with sendfile on Linux.
+# Smaller ones are cheaper to batch with WRITE_BUFFER_SIZE than to copy with a syscall each.
+SENDFILE_MIN_SIZE = 64 * 1024
+
+# Bytes peeked at the start of a source to check it is UTF-8 before it is copied without decoding.
+UTF8_PEEK_SIZE = 4096
+
+# Free space a RAM-backed temp directory needs, as a multiple of the total input JAR size.
+# Decompiled sources are many times larger than the compressed classes they came from.
+RAM_TEMP_SIZE_FACTOR = 40
+
+# Upper bound on decompiled files each combined-mode worker queues ahead of the writer.
+COMBINED_QUEUE_SIZE = 1024
+
 def setup_logging():
     """Sets up simple logging."""
     logging.basicConfig(
@@ -29,21 +92,72 @@ def setup_logging():
         stream=sys.stdout,
     )
 
+def read_release_cache() -> Tuple[Dict | None, bool]:
+    """Returns the cached release metadata, if any, and whether it is still fresh."""
+    try:
+        age = time.time() - RELEASE_CACHE_PATH.stat().st_mtime
+        with open(RELEASE_CACHE_PATH, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None, False
+    if not isinstance(cache, dict) or not isinstance(cache.get('release'), dict):
+        return None, False
+    return cache, age < RELEASE_CACHE_MAX_AGE
+
+def write_release_cache(release_data: Dict, etag: str | None):
+    """Atomically stores the release metadata and its ETag for later runs."""
+    try:
+        RELEASE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        temp_cache_path = RELEASE_CACHE_PATH.with_suffix('.json.part')
+        with open(temp_cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'etag': etag, 'release': release_data}, f)
+        os.replace(temp_cache_path, RELEASE_CACHE_PATH)
+    except OSError as e:
+        logging.warning(f"Could not cache release information: {e}")
+
+def select_release_asset(release_data: Dict) -> Dict | None:
+    """Picks the decompiler jar from a GitHub release."""
+    assets = release_data.get('assets', [])
+    # Prioritize the full jar, fallback to any jar if not found.
+    asset = next((a for a in assets if a['name'].endswith('.jar') and '-slim' not in a['name']), None)
+    if not asset:
+        asset = next((a for a in assets if a['name'].endswith('.jar')), None)
+    return asset
+
+def is_downloaded(decompiler_path: Path, asset: Dict) -> bool:
+    """Checks the decompiler jar is present, non-empty and matches the size GitHub reports for the release asset."""
+    if not decompiler_path.exists():
+        return False
+    size = decompiler_path.stat().st_size
+    return size > 0 and asset.get('size') in (None, size)
+
 def setup_decompiler(script_dir: Path) -> Path | None:
     """
     Downloads the latest full Vineflower decompiler atomically if needed.
     """
     api_url = "https://api.github.com/repos/Vineflower/vineflower/releases/latest"
+    cache, cache_is_fresh = read_release_cache()
+    if cache_is_fresh:
+        asset = select_release_asset(cache['release'])
+        if asset and is_downloaded(script_dir / asset['name'], asset):
+            logging.info(f"Latest decompiler '{asset['name']}' is already present (cached release info).")
+            return script_dir / asset['name']
+
     logging.info("Checking for the latest decompiler version...")
     try:
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()
-        release_data = response.json()
-        assets = release_data.get('assets', [])
-        # Prioritize the full jar, fallback to any jar if not found.
-        asset = next((a for a in assets if a['name'].endswith('.jar') and '-slim' not in a['name']), None)
-        if not asset:
-            asset = next((a for a in assets if a['name'].endswith('.jar')), None)
+        headers = {'Accept': 'application/vnd.github+json'}
+        if cache and cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        try:
+            with urlopen(Request(api_url, headers=headers), timeout=10) as response:
+                release_data = json.load(response)
+                write_release_cache(release_data, response.headers.get('ETag'))
+        except HTTPError as e:
+            if e.code != 304 or not cache:
+                raise
+            release_data = cache['release']
+            write_release_cache(release_data, cache['etag'])
+        asset = select_release_asset(release_data)
         if not asset:
             logging.error("Could not find a .jar file in the latest GitHub release.")
             return None
@@ -51,7 +165,7 @@ def setup_decompiler(script_dir: Path) -> Path | None:
         latest_jar_name, download_url = asset['name'], asset['browser_download_url']
         decompiler_path = script_dir / latest_jar_name
         
-        if decompiler_path.exists():
+        if is_downloaded(decompiler_path, asset):
             logging.info(f"Latest decompiler '{latest_jar_name}' is already present.")
             return decompiler_path
         
@@ -60,30 +174,78 @@ def setup_decompiler(script_dir: Path) -> Path | None:
 
         logging.info(f"Downloading new decompiler '{latest_jar_name}'...")
         temp_download_path = decompiler_path.with_suffix('.jar.part')
-        with requests.get(download_url, stream=True, timeout=30) as r:
-            r.raise_for_status()
-            with open(temp_download_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+        with urlopen(download_url, timeout=30) as r, open(temp_download_path, 'wb') as f:
+            shutil.copyfileobj(r, f, DOWNLOAD_CHUNK_SIZE)
+            # Make sure the data is on disk before the rename, so a crash can't leave a truncated jar behind.
+            f.flush()
+            os.fsync(f.fileno())
+            if hasattr(os, 'posix_fadvise'):
+                # The jar is not read again until the JVM loads it; keep it from evicting hotter pages.
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
         
-        temp_download_path.rename(decompiler_path)
+        os.replace(temp_download_path, decompiler_path)
         logging.info("Download complete.")
         return decompiler_path
         
-    except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+    except (OSError, json.JSONDecodeError) as e:
+        # URLError, HTTPError and socket timeouts are all OSError subclasses.
         logging.error(f"Failed to check for updates: {e}")
         if 'temp_download_path' in locals() and temp_download_path.exists():
             temp_download_path.unlink()
-        existing = next(script_dir.glob('vineflower-*.jar'), None)
+        existing = next((p for p in script_dir.glob('vineflower-*.jar') if p.stat().st_size > 0), None)
         if existing:
             logging.warning(f"Using existing decompiler as a fallback: {existing.name}")
             return existing
         return None
 
+def strip_binary_resources(jar_path: Path, staging_dir: Path) -> Path:
+    """
+    Returns a copy of the .jar without the binary resources context mode discards anyway, so the
+    decompiler never has to extract them. The original path is returned when the resources are too small
+    a share of the JAR to be worth stripping.
+    """
+    stripped_path = staging_dir / jar_path.name
+    try:
+        with zipfile.ZipFile(jar_path) as zf:
+            infos = zf.infolist()
+            kept = [
+                info for info in infos
+                if info.filename.endswith('.class') or not _BINARY_RE.search(info.filename)
+            ]
+            total_size = sum(info.file_size for info in infos)
+            dropped_size = total_size - sum(info.file_size for info in kept)
+            if len(kept) == len(infos) or dropped_size < total_size * STRIP_MIN_RESOURCE_SHARE:
+                return jar_path
+
+            with zipfile.ZipFile(stripped_path, 'w') as out:
+                for info in kept:
+                    # Keep each entry's compression method, at the fastest level: the staged copy is read only once.
+                    out.writestr(
+                        zipfile.ZipInfo(info.filename, info.date_time), zf.read(info),
+                        compress_type=info.compress_type, compresslevel=1
+                    )
+    except (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError, OSError) as e:
+        # Corrupt, encrypted or unusually compressed entries: let the decompiler deal with the JAR as before.
+        logging.warning(f"Could not pre-scan '{jar_path.name}', decompiling it as is: {e}")
+        stripped_path.unlink(missing_ok=True)
+        return jar_path
+
+    logging.info(f"Skipping {len(infos) - len(kept)} binary resource(s) in '{jar_path.name}'.")
+    return stripped_path
+
+def java_command(decompiler_path: Path, batch: bool = False) -> List[str]:
+    """Builds the java command line prefix used to run the decompiler."""
+    env_opts = os.environ.get('JARPY_JAVA_OPTS')
+    if env_opts is not None:
+        java_opts = shlex.split(env_opts, posix=os.name != 'nt')
+    else:
+        java_opts = JAVA_OPTS if batch else JAVA_OPTS + SINGLE_JAR_JAVA_OPTS
+    return ['java', *java_opts, '-jar', str(decompiler_path)]
+
 def decompile_jar(jar_path: Path, temp_dir: Path, decompiler_path: Path) -> bool:
     """Decompiles a single .jar file into a temporary directory."""
     logging.info(f"Decompiling '{jar_path.name}'...")
-    command = ['java', '-jar', str(decompiler_path), str(jar_path), '--outputdir', str(temp_dir)]
+    command = [*java_command(decompiler_path), str(jar_path), '--outputdir', str(temp_dir)]
     try:
         subprocess.run(command, check=True, capture_output=True, text=True, encoding='utf-8', errors='replace')
         logging.info(f"Successfully decompiled '{jar_path.name}'.")
@@ -95,80 +257,438 @@ def decompile_jar(jar_path: Path, temp_dir: Path, decompiler_path: Path) -> bool
         logging.error(f"Decompiler failed for '{jar_path.name}': {e.stderr}")
         return False
 
+def decompile_many(jar_paths: List[Path], temp_root: Path, decompiler_path: Path) -> Dict[Path, Path]:
+    """
+    Decompiles several .jar files with a single decompiler process to pay JVM startup once.
+    Returns the source directory of every JAR that decompiled successfully. Given several inputs,
+    the decompiler writes one archive per JAR named after it into <temp_root>/batch; those are unpacked to
+    <temp_root>/jars/<stem>. If the batch run fails, or a JAR is missing from its output, that JAR is retried on its own.
+    """
+    src_roots = {}
+    jars_dir, batch_dir = temp_root / 'jars', temp_root / 'batch'
+    jars_dir.mkdir(exist_ok=True)
+    if len(jar_paths) > 1:
+        batch_dir.mkdir()
+        logging.info(f"Decompiling {len(jar_paths)} JARs in one decompiler process...")
+        command = [*java_command(decompiler_path, batch=True), *map(str, jar_paths), '--outputdir', str(batch_dir)]
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True, encoding='utf-8', errors='replace')
+        except FileNotFoundError:
+            logging.error("Java is not installed or not in your system's PATH.")
+            shutil.rmtree(batch_dir, ignore_errors=True)
+            return src_roots
+        except subprocess.CalledProcessError as e:
+            # Output of a failed run may be partial, so none of it is trusted.
+            logging.warning(f"Batch decompilation failed, retrying JARs one by one: {e.stderr}")
+            to_harvest = []
+        else:
+            to_harvest = jar_paths
+
+        for jar_path in to_harvest:
+            produced, src_root = batch_dir / jar_path.name, jars_dir / jar_path.stem
+            if produced.is_dir():
+                produced.rename(src_root)
+            elif produced.is_file() and zipfile.is_zipfile(produced):
+                with zipfile.ZipFile(produced) as zf:
+                    zf.extractall(src_root)
+                produced.unlink()
+            else:
+                continue
+            logging.info(f"Successfully decompiled '{jar_path.name}'.")
+            src_roots[jar_path] = src_root
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+    for jar_path in jar_paths:
+        if jar_path not in src_roots:
+            src_root = jars_dir / jar_path.stem
+            shutil.rmtree(src_root, ignore_errors=True)
+            src_root.mkdir()
+            if decompile_jar(jar_path, src_root, decompiler_path):
+                src_roots[jar_path] = src_root
+    return src_roots
+
+def append_source(out: BinaryIO, pending: bytearray, file_path: Path, write_buffer_size: int) -> int:
+    """
+    Appends a source file to a context file after the bytes already pending for it, and returns its length.
+    Large sources that start as valid UTF-8 are sent kernel-side on Linux; the rest are decoded with
+    replacement characters so the context file stays UTF-8.
+    """
+    with open(file_path, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        if sys.platform == 'linux' and size >= SENDFILE_MIN_SIZE:
+            try:
+                codecs.getincrementaldecoder('utf-8')().decode(src.read(UTF8_PEEK_SIZE))
+            except UnicodeDecodeError:
+                pass
+            else:
+                out.write(pending)
+                pending.clear()
+                out.flush()
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(out.fileno(), src.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return offset
+            src.seek(0)
+        content = src.read().decode('utf-8', errors='replace').encode('utf-8')
+    pending += content
+    if len(pending) > write_buffer_size:
+        out.write(pending)
+        pending.clear()
+    return len(content)
+
 def create_context_files(
-    grouped_files: Dict[str, List[Path]], output_path: Path, src_path: Path, max_size_mb: float
+    entries: List[Tuple[str, Path, int]], output_path: Path, src_path: Path, max_size_mb: float,
+    write_buffer_size: int = WRITE_BUFFER_SIZE
 ) -> List[Path]:
-    """Creates context files for a single JAR's contents."""
+    """Creates context files for a single JAR's contents from (ext, path, size) entries sorted by extension."""
     context_files = []
     max_size_bytes = max_size_mb * 1024 * 1024
     logging.info(f"Creating context files in '{output_path}'...")
 
-    for ext, files in grouped_files.items():
-        if ext in BINARY_EXTENSIONS:
-            logging.info(f"  -> Skipping binary file type: {ext}")
-            continue
-
-        files.sort()
-        part_num, current_size, outfile = 1, 0, None
+    for ext, files in itertools.groupby(entries, key=operator.itemgetter(0)):
+        part_num, current_size, outfile, buf = 1, 0, None, bytearray()
         base_filename_stem = f"{ext[1:] if ext.startswith('.') else ext}_context"
 
-        for file_path in files:
-            try:
-                file_size = file_path.stat().st_size
-            except FileNotFoundError:
-                continue
-
+        for _, file_path, file_size in files:
             if outfile and (current_size + file_size) > max_size_bytes and current_size > 0:
+                outfile.write(buf)
+                buf.clear()
                 outfile.close()
                 outfile, part_num, current_size = None, part_num + 1, 0
 
             if outfile is None:
                 context_filename = f"{base_filename_stem}_{part_num}.txt"
                 context_filepath = output_path / context_filename
-                outfile = open(context_filepath, 'w', encoding='utf-8', errors='replace')
+                outfile = open(context_filepath, 'wb')
                 context_files.append(context_filepath)
-            
-            header = f"\n{'='*25} START: {file_path.relative_to(src_path)} {'='*25}\n\n"
-            outfile.write(header)
-            try:
-                content = file_path.read_text(encoding='utf-8')
-            except UnicodeDecodeError:
-                content = file_path.read_text(encoding='latin-1', errors='replace')
-            outfile.write(content)
+
+            header = f"\n{_EQ25} START: {file_path.relative_to(src_path)} {_EQ25}\n\n"
+            buf += header.encode('utf-8')
+            append_source(outfile, buf, file_path, write_buffer_size)
             current_size += file_size
         if outfile:
+            outfile.write(buf)
             outfile.close()
     return context_files
 
-def create_archives(files: List[Path], output_path: Path, chunk_size: int, prefix: str, src_path: Path = None):
-    """Zips the provided files into one or more archives."""
+def zip_with_7zip(seven_zip: str, zip_filename: Path, files: List[Path], src_path: Path = None) -> bool:
+    """Creates a maximum-compression zip archive with an external 7-Zip binary."""
+    base_path = src_path or files[0].parent
+    command = [seven_zip, 'a', '-tzip', '-mx=9', str(zip_filename), '--']
+    command += [str(file_path.relative_to(base_path)) for file_path in files]
+    zip_filename.unlink(missing_ok=True)
+    try:
+        subprocess.run(command, check=True, capture_output=True, text=True, errors='replace', cwd=base_path)
+        return True
+    except subprocess.CalledProcessError as e:
+        logging.warning(f"7-Zip failed for '{zip_filename.name}', falling back to zipfile: {e.stderr}")
+        zip_filename.unlink(missing_ok=True)
+        return False
+
+def _zip_chunk(task: Tuple[Path, List[Path], Path | None, str, str | None]):
+    """Writes a single archive. Runs in a worker process for multi-archive jobs."""
+    zip_filename, chunk, src_path, compress, seven_zip = task
+    if seven_zip and zip_with_7zip(seven_zip, zip_filename, chunk, src_path):
+        return
+    compression, compresslevel = COMPRESSION_LEVELS[compress]
+    with zipfile.ZipFile(zip_filename, 'w', compression, allowZip64=True, compresslevel=compresslevel) as zipf:
+        for file_path in chunk:
+            arcname = str(file_path.relative_to(src_path) if src_path else file_path.name)
+            zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+            if zinfo.file_size > ZIP_IN_MEMORY_MAX_SIZE:
+                zipf.write(file_path, arcname)
+                continue
+            zipf.writestr(zinfo, file_path.read_bytes(), compress_type=compression, compresslevel=compresslevel)
+
+def create_archives(
+    files: List[Path], output_path: Path, chunk_size: int, prefix: str, src_path: Path = None, compress: str = 'fast',
+    pool: ProcessPoolExecutor | None = None
+):
+    """Zips the provided files into one or more archives, spreading them over the process pool when given."""
     if not files:
         logging.info("No files to archive.")
         return
     num_archives = (len(files) + chunk_size - 1) // chunk_size
     logging.info(f"Creating {num_archives} archive(s)...")
-    files.sort()
+    seven_zip = (shutil.which('7zz') or shutil.which('7z')) if compress == 'best' else None
+    tasks = []
     for i in range(0, len(files), chunk_size):
         chunk = files[i:i + chunk_size]
         archive_num = (i // chunk_size) + 1
         zip_filename = output_path / f'{prefix}_{archive_num}.zip'
         logging.info(f"Creating '{zip_filename}' with {len(chunk)} files...")
-        with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in chunk:
-                arcname = file_path.relative_to(src_path) if src_path else file_path.name
-                zipf.write(file_path, arcname)
+        tasks.append((zip_filename, chunk, src_path, compress, seven_zip))
+
+    if pool is None or num_archives == 1:
+        for task in tasks:
+            _zip_chunk(task)
+    else:
+        list(pool.map(_zip_chunk, tasks))
     logging.info(f"Archive creation complete.")
 
-def main(decompiler_path: Path):
-    """Main processing logic, runs after setup is confirmed."""
+def _is_sorted(items: List, key) -> bool:
+    """Checks a list is in ascending order of key in a single pass."""
+    return all(key(a) <= key(b) for a, b in itertools.pairwise(items))
+
+def _scandir_sorted(path: str | Path) -> List[os.DirEntry]:
+    """Lists a directory's entries in reverse name order, ready to be used as a stack."""
+    with os.scandir(path) as entries:
+        return sorted(entries, key=lambda entry: entry.name, reverse=True)
+
+def walk_files(root: Path, skip_binary: bool = False) -> Iterator[Tuple[Path, int]]:
+    """
+    Yields (path, size) for every regular file below root in sorted path order,
+    leaving out BINARY_EXTENSIONS when skip_binary is set.
+    Uses os.scandir so the type check and size come from the directory entry instead of extra stat calls.
+    """
+    stack = _scandir_sorted(root)
+    while stack:
+        entry = stack.pop()
+        if entry.is_dir(follow_symlinks=False):
+            stack.extend(_scandir_sorted(entry.path))
+        elif entry.is_file(follow_symlinks=False):
+            if skip_binary and _BINARY_RE.search(entry.name):
+                continue
+            yield Path(entry.path), entry.stat(follow_symlinks=False).st_size
+
+def list_files_by_extension(root: Path) -> List[Tuple[str, Path, int]]:
+    """
+    Lists every non-binary file below root as (ext, path, size),
+    sorted so each extension forms one contiguous run.
+    """
+    entries = [
+        (file_path.suffix.lower() or 'no_extension', file_path, file_size)
+        for file_path, file_size in walk_files(root, skip_binary=True)
+    ]
+    # walk_files already yields paths in order, so a stable sort on the extension alone is enough.
+    entries.sort(key=operator.itemgetter(0))
+    # Compare name by name, as the walk does; Path ordering is case-insensitive on Windows.
+    assert _is_sorted(entries, key=lambda entry: (entry[0], entry[1].parts)), "decompiled files must be grouped in a deterministic order"
+    return entries
+
+def _advise_willneed(file_paths: List[Path]):
+    """Asks the kernel to start reading each file into the page cache."""
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+def prefetch_files(entries: List[Tuple[str, Path, int]]):
+    """
+    Starts a background thread that issues read-ahead hints for the text files about to be read,
+    so a cold page cache fills while the context files are being written. No-op without posix_fadvise.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    file_paths = [file_path for _, file_path, _ in entries]
+    threading.Thread(target=_advise_willneed, args=(file_paths,), daemon=True).start()
+
+def choose_temp_root(jar_files: List[Path], override: str | None) -> str | None:
+    """
+    Picks where decompiled output is staged: the --temp-dir override, else a RAM-backed filesystem
+    (/dev/shm, or %RAMDISK% on Windows) with enough free space, else None for the system default.
+    """
+    if override:
+        return override
+    candidate = os.environ.get('RAMDISK') if os.name == 'nt' else '/dev/shm'
+    if not candidate or not Path(candidate).is_dir():
+        return None
+    needed = sum(jar_path.stat().st_size for jar_path in jar_files) * RAM_TEMP_SIZE_FACTOR
+    try:
+        free = shutil.disk_usage(candidate).free
+    except OSError:
+        return None
+    if free <= needed:
+        return None
+    logging.info(f"Staging decompiled output in RAM-backed '{candidate}'.")
+    return candidate
+
+def process_one_jar(
+    jar_path: Path, src_root: Path, args: argparse.Namespace, script_dir: Path,
+    archive_pool: ProcessPoolExecutor | None = None
+):
+    """Archives a decompiled .jar file into its own output folder (individual mode)."""
+    logging.info(f"\n--- Processing individually: {jar_path.name} ---")
+    output_path = script_dir / f"_decompiled_{jar_path.stem}"
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    if args.mode == 'context':
+        entries = list_files_by_extension(src_root)
+        prefetch_files(entries)
+        context_files = create_context_files(
+            entries, output_path, src_root, args.max_size, args.tmp_file_max_memory_size
+        )
+        create_archives(
+            context_files, output_path, args.size, f"context_{jar_path.stem}", compress=args.compress, pool=archive_pool
+        )
+
+    elif args.mode == 'direct':
+        all_files = [file_path for file_path, _ in walk_files(src_root)]
+        assert _is_sorted(all_files, key=lambda file_path: file_path.parts), "archived files must be in a deterministic order"
+        create_archives(
+            all_files, output_path, args.size, f"direct_{jar_path.stem}", src_path=src_root, compress=args.compress,
+            pool=archive_pool
+        )
+
+def feed_combined_jar(jar_path: Path, src_root: Path | None, write_queue: queue.Queue):
+    """
+    Queues the source files of a decompiled .jar file for the combined writer, which reads them itself,
+    followed by an end-of-JAR event. A JAR that failed to decompile (src_root is None) still queues the event
+    to keep the JAR order. Waits for the writer to reach the event, so src_root can be removed afterwards.
+    """
+    jar_done = threading.Event()
+    if src_root is not None:
+        logging.info(f"\n--- Processing for combined output: {jar_path.name} ---")
+        entries = list_files_by_extension(src_root)
+        prefetch_files(entries)
+        for ext, file_path, file_size in entries:
+            write_queue.put((ext, jar_path.name, file_path, file_size))
+    write_queue.put(jar_done)
+    if src_root is not None:
+        jar_done.wait()
+
+def process_jar_batch(
+    jar_paths: List[Path], decompiler_path: Path, args: argparse.Namespace, script_dir: Path,
+    temp_root: str | None = None, write_queue: queue.Queue | None = None,
+    archive_pool: ProcessPoolExecutor | None = None
+):
+    """
+    Decompiles a batch of .jar files with one decompiler process, then hands each JAR's output
+    to the combined writer (when write_queue is given) or to its own output folder.
+    The combined writer gets every JAR's files and end-of-JAR event in batch order, then a None sentinel, even on failure.
+    """
+    try:
+        with tempfile.TemporaryDirectory(dir=temp_root) as temp_dir_str:
+            temp_dir = Path(temp_dir_str)
+            input_dir, output_dir = temp_dir / 'input', temp_dir / 'output'
+            input_dir.mkdir()
+            output_dir.mkdir()
+
+            # Context output ignores binary resources, so don't make the decompiler unpack them.
+            if write_queue is not None or args.mode == 'context':
+                originals = {strip_binary_resources(jar_path, input_dir): jar_path for jar_path in jar_paths}
+            else:
+                originals = {jar_path: jar_path for jar_path in jar_paths}
+
+            src_roots = decompile_many(list(originals), output_dir, decompiler_path)
+            for decompiled_path, jar_path in originals.items():
+                src_root = src_roots.get(decompiled_path)
+                if write_queue is not None:
+                    feed_combined_jar(jar_path, src_root, write_queue)
+                elif src_root is not None:
+                    process_one_jar(jar_path, src_root, args, script_dir, archive_pool)
+                if src_root is not None:
+                    shutil.rmtree(src_root, ignore_errors=True)
+    finally:
+        if write_queue is not None:
+            write_queue.put(None)
+
+def write_combined_context(
+    write_queues: List[queue.Queue], output_path: Path, max_size_mb: float,
+    write_buffer_size: int = WRITE_BUFFER_SIZE
+) -> List[Path]:
+    """
+    Drains the per-worker queues into context files per extension until each has sent its None sentinel,
+    rolling over to a new part whenever one would exceed max_size_mb.
+    Worker i is handed jar_files[i::workers], so taking one JAR from each queue in turn, up to its end-of-JAR
+    event, writes the JARs in jar_files order and identical inputs give identical output.
+    Runs on a single thread so the open buffers never need locking.
+    """
+    max_size_bytes = max_size_mb * 1024 * 1024
+    # ext -> (part_num, current_size, handle, pending bytes)
+    open_files: Dict[str, Tuple[int, int, BinaryIO, bytearray]] = {}
+    created_context_files = []
+    live_queues = deque(write_queues)
+    try:
+        while live_queues:
+            item = live_queues[0].get()
+            if item is None:
+                live_queues.popleft()
+                continue
+            if isinstance(item, threading.Event):
+                # The JAR is written, so its worker may delete the sources; the next worker's JAR is due.
+                item.set()
+                live_queues.rotate(-1)
+                continue
+            ext, jar_name, file_path, file_size = item
+            part_num, current_size, handle, buf = open_files.get(ext, (0, 0, None, None))
+            header = f"\n{_EQ30}\n=== SOURCE JAR: {jar_name}\n=== FILE:       {file_path.name}\n{_EQ30}\n\n"
+            header_bytes = header.encode('utf-8')
+
+            # Count the headers too, so a part never grows past max_size_bytes unless one file alone does.
+            if handle and (current_size + len(header_bytes) + file_size) > max_size_bytes and current_size > 0:
+                handle.write(buf)
+                handle.close()
+                handle = None
+
+            if handle is None:
+                part_num, current_size, buf = part_num + 1, 0, bytearray()
+                context_filename = f"{(ext[1:] if ext.startswith('.') else ext)}_context_{part_num}.txt"
+                context_filepath = output_path / context_filename
+                handle = open(context_filepath, 'wb')
+                created_context_files.append(context_filepath)
+
+            buf += header_bytes
+            content_size = append_source(handle, buf, file_path, write_buffer_size)
+            open_files[ext] = (part_num, current_size + len(header_bytes) + content_size, handle, buf)
+    except BaseException:
+        # Keep draining so producers blocked on a full queue or waiting on a JAR can finish.
+        for write_queue in live_queues:
+            while (item := write_queue.get()) is not None:
+                if isinstance(item, threading.Event):
+                    item.set()
+        for _, _, handle, _ in open_files.values():
+            handle.close()
+        raise
+
+    logging.info("Writing all context files...")
+    for _, _, handle, buf in open_files.values():
+        handle.write(buf)
+        handle.close()
+    return created_context_files
+
+def parse_args() -> argparse.Namespace:
+    """Parses the command line."""
     parser = argparse.ArgumentParser(description="A tool to decompile and archive .jar files.")
     parser.add_argument("input_directory", help="The directory containing .jar files to process.")
     parser.add_argument("--combine", action='store_true', help="Combine all JARs into a single output folder.")
     parser.add_argument("--mode", choices=['direct', 'context'], default='context', help="Archiving mode.")
     parser.add_argument("-s", "--size", type=int, default=10, help="Number of files per ZIP archive.")
+    parser.add_argument(
+        "--compress", choices=list(COMPRESSION_LEVELS), default='fast',
+        help="ZIP compression: none (store only), fast (deflate level 1) or best (7-Zip if installed, else deflate level 9)."
+    )
     parser.add_argument("--max-size", type=float, default=100.0, help="(Context Mode) Max size of each context file in MB.")
+    parser.add_argument(
+        "--temp-dir",
+        help="Directory for decompiler output. Defaults to /dev/shm (or %%RAMDISK%% on Windows) when it has room."
+    )
+    parser.add_argument(
+        "--tmp-file-max-memory-size", type=int, default=WRITE_BUFFER_SIZE,
+        help="(Context Mode) Bytes of context output batched in memory between writes to disk."
+    )
+    parser.add_argument(
+        "--no-prompt", action='store_true', help="Exit without waiting for Enter (implied when stdin is not a terminal)."
+    )
+    return parser.parse_args()
+
+def pause_before_exit(args: argparse.Namespace, message: str = "Press Enter to exit..."):
+    """Keeps a double-clicked console window open, unless running non-interactively."""
+    if not args.no_prompt and sys.stdin is not None and sys.stdin.isatty():
+        input(message)
 
-    args = parser.parse_args()
+def main(decompiler_path: Path, args: argparse.Namespace):
+    """Main processing logic, runs after setup is confirmed."""
     script_dir = Path(__file__).parent.resolve()
     input_dir = Path(args.input_directory)
 
@@ -176,96 +696,74 @@ def main(decompiler_path: Path):
         logging.error(f"Error: Provided path '{input_dir}' is not a valid directory.")
         return
 
+    if args.temp_dir and not Path(args.temp_dir).is_dir():
+        logging.error(f"Error: Provided temp directory '{args.temp_dir}' is not a valid directory.")
+        return
+
     jar_files = sorted(list(input_dir.glob('*.jar')))
     if not jar_files:
         logging.warning(f"No .jar files found in '{input_dir}'.")
         return
     
     logging.info(f"Found {len(jar_files)} .jar file(s) to process in '{input_dir.name}'.")
+    temp_root = choose_temp_root(jar_files, args.temp_dir)
+    # Each JAR is independent and the time is spent in the decompiler subprocess, so threads suffice.
+    # Every worker gets one batch so JVM startup is paid once per worker rather than once per JAR.
+    max_workers = min(len(jar_files), os.cpu_count() or 1)
+    batches = [jar_files[i::max_workers] for i in range(max_workers)]
 
-    if args.combine:
-        # --- REFACTORED COMBINED MODE (MEMORY EFFICIENT) ---
-        output_path = script_dir / f"_decompiled_combined_{input_dir.name}"
-        output_path.mkdir(parents=True, exist_ok=True)
-        
-        open_files = {}
-        created_context_files = set()
+    # Compression is CPU-bound, so archives are built in one shared pool of processes, started on first use.
+    # 'spawn' matches Windows and avoids forking while decompiler worker threads are running.
+    archive_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context('spawn'))
+    with archive_pool:
+        if args.combine:
+            output_path = script_dir / f"_decompiled_combined_{input_dir.name}"
+            output_path.mkdir(parents=True, exist_ok=True)
 
-        try:
-            for i, jar_path in enumerate(jar_files):
-                logging.info(f"\n--- Processing ({i+1}/{len(jar_files)}) for combined output: {jar_path.name} ---")
-                with tempfile.TemporaryDirectory() as temp_dir_str:
-                    temp_dir = Path(temp_dir_str)
-                    if decompile_jar(jar_path, temp_dir, decompiler_path):
-                        current_jar_groups = defaultdict(list)
-                        for file_path in temp_dir.rglob('*'):
-                            if file_path.is_file():
-                                ext = file_path.suffix.lower() or 'no_extension'
-                                current_jar_groups[ext].append(file_path)
-
-                        for ext, files in current_jar_groups.items():
-                            if ext in BINARY_EXTENSIONS:
-                                continue
-
-                            if ext not in open_files:
-                                context_filename = f"{(ext[1:] if ext.startswith('.') else ext)}_context_1.txt"
-                                context_filepath = output_path / context_filename
-                                open_files[ext] = open(context_filepath, 'a', encoding='utf-8', errors='replace')
-                                created_context_files.add(context_filepath)
-                            
-                            handle = open_files[ext]
-                            for file_path in sorted(files):
-                                header = f"\n{'='*30}\n=== SOURCE JAR: {jar_path.name}\n=== FILE:       {file_path.name}\n{'='*30}\n\n"
-                                handle.write(header)
-                                try:
-                                    content = file_path.read_text(encoding='utf-8')
-                                except UnicodeDecodeError:
-                                    content = file_path.read_text(encoding='latin-1', errors='replace')
-                                handle.write(content)
-        finally:
-            logging.info("Closing all context files...")
-            for handle in open_files.values():
-                handle.close()
+            write_queues = [queue.Queue(maxsize=COMBINED_QUEUE_SIZE) for _ in batches]
+            with ThreadPoolExecutor(max_workers=1) as writer_pool:
+                writer = writer_pool.submit(
+                    write_combined_context, write_queues, output_path, args.max_size, args.tmp_file_max_memory_size
+                )
+                with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                    list(ex.map(
+                        lambda batch, write_queue: process_jar_batch(
+                            batch, decompiler_path, args, script_dir, temp_root, write_queue
+                        ),
+                        batches, write_queues
+                    ))
+                # Parts of different extensions are created interleaved; archive each extension's parts together.
+                created_context_files = sorted(writer.result())
 
-        create_archives(list(created_context_files), output_path, args.size, "combined_context")
+            create_archives(
+                created_context_files, output_path, args.size, "combined_context", compress=args.compress,
+                pool=archive_pool
+            )
 
-    else: # Individual Mode
-        for i, jar_path in enumerate(jar_files):
-            logging.info(f"\n--- Processing ({i+1}/{len(jar_files)}) individually: {jar_path.name} ---")
-            output_path = script_dir / f"_decompiled_{jar_path.stem}"
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            with tempfile.TemporaryDirectory() as temp_dir_str:
-                temp_dir = Path(temp_dir_str)
-                if decompile_jar(jar_path, temp_dir, decompiler_path):
-                    if args.mode == 'context':
-                        grouped_files = defaultdict(list)
-                        for file_path in temp_dir.rglob('*'):
-                             if file_path.is_file():
-                                ext = file_path.suffix.lower() or 'no_extension'
-                                grouped_files[ext].append(file_path)
-                        
-                        context_files = create_context_files(grouped_files, output_path, temp_dir, args.max_size)
-                        create_archives(context_files, output_path, args.size, f"context_{jar_path.stem}")
-                    
-                    elif args.mode == 'direct':
-                        all_files = [p for p in temp_dir.rglob('*') if p.is_file()]
-                        create_archives(all_files, output_path, args.size, f"direct_{jar_path.stem}", src_path=temp_dir)
+        else: # Individual Mode
+            with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                list(ex.map(
+                    lambda batch: process_jar_batch(
+                        batch, decompiler_path, args, script_dir, temp_root, archive_pool=archive_pool
+                    ),
+                    batches
+                ))
 
     logging.info(f"\n--- All jobs complete. ---")
-    input("Press Enter to exit...")
+    pause_before_exit(args)
 
 def cli():
     """CLI entry point. Handles setup before calling main logic."""
     setup_logging()
+    args = parse_args()
     script_dir = Path(__file__).parent.resolve()
     decompiler_path = setup_decompiler(script_dir)
     
     if decompiler_path:
-        main(decompiler_path)
+        main(decompiler_path, args)
     else:
         logging.error("Could not find or download the decompiler. Exiting.")
-        input("\nPress Enter to exit...")
+        pause_before_exit(args, "\nPress Enter to exit...")
 
 if __name__ == "__main__":
     cli()
@@ -2,28 +2,7 @@
 setlocal enabledelayedexpansion
 
 :: ============================================================================
-:: 1. DEPENDENCY CHECK
-:: Ensures the 'requests' library for Python is installed.
-:: ============================================================================
-echo [*] Checking for required Python library 'requests'...
-python -c "import requests" 2>nul
-if errorlevel 1 (
-    echo [!] 'requests' not found. Attempting to install via pip...
-    python -m pip install requests
-    if errorlevel 1 (
-        echo.
-        echo [X] ERROR: Failed to install 'requests'.
-        echo Please install it manually: python -m pip install requests
-        echo.
-        pause
-        exit /b
-    )
-) else (
-    echo [+] 'requests' is already installed.
-)
-
-:: ============================================================================
-:: 2. SCRIPT EXECUTION
+:: SCRIPT EXECUTION
 :: Gathers user input and calls the Python script with the correct arguments.
 :: ============================================================================
 echo.